@@ -0,0 +1,83 @@
+"""
+Measures scanning a compressed tar archive of daily fstab snapshots where
+most days are unchanged.
+
+Run with: python benchmarks/bench_archive.py
+"""
+import io
+import os
+import sys
+import tarfile
+import tempfile
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from pyfstab import Fstab
+from pyfstab.archive import iter_archive
+
+DAYS = 3650
+CHANGE_EVERY = 30
+ENTRIES = 200
+
+
+def snapshot(version):
+    lines = ["# Snapshot version {}".format(version)]
+    for i in range(ENTRIES):
+        lines.append(
+            "UUID={:08x}-{} /mnt/disk{} ext4 rw,relatime 0 2".format(
+                i, version, i
+            )
+        )
+    return "\n".join(lines).encode("utf-8")
+
+
+def write_archive(path):
+    with tarfile.open(path, "w:gz") as tar:
+        for day in range(DAYS):
+            data = snapshot(day // CHANGE_EVERY)
+            info = tarfile.TarInfo("host/{:05}".format(day))
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def scan_extract(path, directory):
+    # What iter_archive replaces: extract to disk, then parse every file
+    with tarfile.open(path, "r:*") as tar:
+        tar.extractall(directory)
+    root = os.path.join(directory, "host")
+    for name in sorted(os.listdir(root)):
+        with open(os.path.join(root, name), "r") as handle:
+            Fstab().read_file(handle)
+
+
+def scan_archive(path):
+    for _ in iter_archive(path):
+        pass
+
+
+def report(name, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(
+        "{:<24} {:>8.1f} ms {:>10.0f} snapshots/s".format(
+            name, elapsed * 1000, DAYS / elapsed
+        )
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshots.tar.gz")
+        write_archive(path)
+
+        report(
+            "extract and read_file",
+            scan_extract,
+            path,
+            os.path.join(directory, "extracted"),
+        )
+        report("iter_archive", scan_archive, path)
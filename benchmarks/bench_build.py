@@ -0,0 +1,69 @@
+"""
+Measures building and formatting large fstabs.
+
+Run with: python benchmarks/bench_build.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from pyfstab import Entry, Fstab
+
+COUNT = 10000
+REPEAT = 5
+
+rows = [
+    (
+        "/srv/data/{}".format(i),
+        "/mnt/bind/{}".format(i),
+        "none",
+        "bind,ro",
+        0,
+        0,
+    )
+    for i in range(COUNT)
+]
+
+
+def build_entries():
+    # What add_rows replaces: one Entry at a time, indexes updated by hand
+    fstab = Fstab()
+    for row in rows:
+        entry = Entry(*row)
+        fstab.entries.append(entry)
+        fstab.entries_by_device[entry.device].append(entry)
+        fstab.entry_by_dir[entry.dir] = entry
+        fstab.entries_by_type[entry.type].append(entry)
+    return fstab
+
+
+def build_rows():
+    return Fstab().add_rows(rows)
+
+
+def build_columns():
+    return Fstab().add_columns(*zip(*rows))
+
+
+fstab = build_rows()
+
+
+def report(name, func):
+    best = min(timeit.repeat(func, number=1, repeat=REPEAT))
+    print(
+        "{:<24} {:>8.2f} ms {:>12.0f} entries/s".format(
+            name, best * 1000, COUNT / best
+        )
+    )
+
+
+if __name__ == "__main__":
+    report("Entry() one by one", build_entries)
+    report("add_rows", build_rows)
+    report("add_columns", build_columns)
+    report("write_string", fstab.write_string)
+    report("write_string aligned", lambda: fstab.write_string(True))
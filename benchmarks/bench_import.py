@@ -0,0 +1,72 @@
+"""
+Measures cold start: importing pyfstab and running the CLI in a new process.
+
+Run with: python benchmarks/bench_import.py [FSTAB]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+REPEAT = 30
+
+SAMPLE = """\
+# /etc/fstab: static file system information.
+UUID=0a3407de-014b-458b-b5c1-848e92a327a3 / ext4 rw,relatime 0 1
+UUID=b411dc99-f0a0-4c87-9e05-184977be8539 /home ext4 rw,relatime 0 2
+UUID=CBB6-24F2 /boot vfat rw,relatime,fmask=0022,dmask=0022 0 2
+UUID=f9fe0b69-a280-415d-a03a-a32752370dee none swap defaults 0 0
+tmpfs /tmp tmpfs rw,nosuid,nodev 0 0
+"""
+
+
+def best_of(args):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, args, baseline=None):
+    best = best_of(args)
+    line = "{:<28} {:>8.2f} ms".format(name, best * 1000)
+    if baseline is not None:
+        line += " {:>+8.2f} ms".format((best - baseline) * 1000)
+    print(line)
+    return best
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        handle = tempfile.NamedTemporaryFile("w", suffix=".fstab")
+        handle.write(SAMPLE)
+        handle.flush()
+        path = handle.name
+
+    python = sys.executable
+    print("{:<28} {:>11} {:>11}".format("", "wall", "over base"))
+    base = report("python -c pass", [python, "-c", "pass"])
+    report("import pyfstab", [python, "-c", "import pyfstab"], base)
+    report(
+        "python -m pyfstab validate",
+        [python, "-m", "pyfstab", "validate", path],
+        base,
+    )
+    report(
+        "python -m pyfstab query",
+        [python, "-m", "pyfstab", "query", "--dir", "/", path],
+        base,
+    )
+    report(
+        "python -m pyfstab format",
+        [python, "-m", "pyfstab", "format", "--aligned", path],
+        base,
+    )
@@ -0,0 +1,43 @@
+"""
+Measures parsing a large, comment-heavy fstab.
+
+Run with: python benchmarks/bench_parse.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+)
+
+from pyfstab import Fstab, parse_lines
+
+COUNT = 5000
+REPEAT = 7
+
+lines = []
+for i in range(COUNT):
+    lines.append("# Data disk {}, mounted by the provisioning job".format(i))
+    lines.append("")
+    lines.append("UUID={:08x} /mnt/disk{} ext4 rw,relatime 0 2".format(i, i))
+data = "\n".join(lines)
+
+
+def report(name, func):
+    best = min(timeit.repeat(func, number=1, repeat=REPEAT))
+    print(
+        "{:<24} {:>8.2f} ms {:>12.0f} lines/s".format(
+            name, best * 1000, len(lines) / best
+        )
+    )
+
+
+if __name__ == "__main__":
+    report("read_string", lambda: Fstab().read_string(data))
+    report("read_string lazy", lambda: Fstab().read_string(data, lazy=True))
+    report(
+        "read_string non-strict",
+        lambda: Fstab().read_string(data, strict=False),
+    )
+    report("parse_lines", lambda: parse_lines(data))
@@ -1,4 +1,6 @@
 __version__ = "0.2.0"
 
 from .fstab import Fstab
-from .entry import Entry, InvalidEntry, InvalidFstabLine
+from .entry import Entry, LazyEntry, InvalidEntry, InvalidFstabLine
+from .lines import ParsedLine, parse_lines
+from .snapshot import FrozenEntry, FstabSnapshot, SnapshotPublisher
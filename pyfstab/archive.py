@@ -0,0 +1,291 @@
+"""
+Reading fstab snapshots straight from compressed archives.
+
+Supported inputs are tar archives, JSON lines files and single fstab files,
+each either uncompressed or compressed with gzip, xz, bzip2 or (on Python
+versions whose standard library has the compression.zstd module) zstd. The
+compression is detected from the content, not from the file name.
+
+Members are read one at a time, so memory use does not grow with the size of
+the archive. Only the content hashes of the already seen snapshots are kept.
+
+This module is not imported by ``import pyfstab``, as its dependencies would
+slow down the startup of the CLI.
+"""
+import hashlib
+import io
+import json
+import tarfile
+
+from .fstab import Fstab
+from .lines import parse_lines
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+_BZIP2_MAGIC = b"BZh"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_COMPRESSION_SUFFIXES = (".gz", ".tgz", ".xz", ".txz", ".bz2", ".zst")
+
+
+class ArchiveMember:
+    """
+    Single fstab snapshot read from an archive.
+
+    :var name:
+        (str) -
+        Name of the tar member, "<path>:<line number>" for JSON lines files
+        without a name field, or the path for single files.
+
+    :var digest:
+        (str) -
+        SHA-256 hex digest of the snapshot contents.
+
+    :var fstab:
+        (Fstab or None) -
+        Parsed snapshot. None if the same contents were already seen.
+
+    :var invalid_lines:
+        (list[ParsedLine]) -
+        Lines that could not be parsed. Empty for duplicates.
+
+    :var duplicate_of:
+        (str or None) -
+        Name of the member with the same contents that was seen first.
+    """
+
+    __slots__ = (
+        "name",
+        "digest",
+        "fstab",
+        "invalid_lines",
+        "duplicate_of",
+    )
+
+    def __init__(
+        self, name, digest, fstab=None, invalid_lines=(), duplicate_of=None
+    ):
+        self.name = name
+        self.digest = digest
+        self.fstab = fstab
+        self.invalid_lines = list(invalid_lines)
+        self.duplicate_of = duplicate_of
+
+    def __repr__(self):
+        if self.duplicate_of is not None:
+            return "<ArchiveMember {} duplicate of {}>".format(
+                self.name, self.duplicate_of
+            )
+
+        return "<ArchiveMember {} [{} entries]>".format(
+            self.name, len(self.fstab.entries)
+        )
+
+
+class _Prefixed(io.RawIOBase):
+    # Stream that returns the already read header before the rest of the
+    # underlying stream
+
+    def __init__(self, head, stream):
+        self._head = head
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._head:
+            size = min(len(buffer), len(self._head))
+            buffer[:size] = self._head[:size]
+            self._head = self._head[size:]
+            return size
+
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _open_decompressed(path):
+    handle = open(path, "rb")
+    magic = handle.read(6)
+    handle.seek(0)
+
+    if magic.startswith(_GZIP_MAGIC):
+        import gzip
+
+        return gzip.GzipFile(fileobj=handle, mode="rb"), handle
+    elif magic.startswith(_XZ_MAGIC):
+        import lzma
+
+        return lzma.LZMAFile(handle, "rb"), handle
+    elif magic.startswith(_BZIP2_MAGIC):
+        import bz2
+
+        return bz2.BZ2File(handle, "rb"), handle
+    elif magic.startswith(_ZSTD_MAGIC):
+        try:
+            from compression import zstd
+        except ImportError:
+            handle.close()
+            raise ValueError(
+                "{}: zstd needs Python 3.14 or newer".format(path)
+            )
+
+        return zstd.ZstdFile(handle, "rb"), handle
+
+    return handle, handle
+
+
+def _is_tar_header(head):
+    # POSIX and GNU tar headers have their magic at offset 257
+    return len(head) >= 262 and head[257:262] == b"ustar"
+
+
+def _strip_compression_suffix(path):
+    for suffix in _COMPRESSION_SUFFIXES:
+        if path.endswith(suffix):
+            return path[: -len(suffix)]
+
+    return path
+
+
+def _iter_tar(stream):
+    with tarfile.open(fileobj=stream, mode="r|") as tar:
+        for info in tar:
+            if info.isfile():
+                yield info.name, tar.extractfile(info).read()
+
+
+def _iter_jsonl(path, stream, content_key, name_key):
+    for lineno, line in enumerate(io.TextIOWrapper(stream, "utf-8"), 1):
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+
+        try:
+            data = record[content_key]
+        except (KeyError, TypeError):
+            raise ValueError(
+                "{}:{}: record has no {!r} field".format(
+                    path, lineno, content_key
+                )
+            )
+
+        if not isinstance(data, str):
+            raise ValueError(
+                "{}:{}: {!r} field is not a string".format(
+                    path, lineno, content_key
+                )
+            )
+
+        try:
+            data = data.encode("utf-8", "surrogateescape")
+        except UnicodeEncodeError:
+            raise ValueError(
+                "{}:{}: {!r} field is not valid text".format(
+                    path, lineno, content_key
+                )
+            )
+
+        name = record.get(name_key)
+        if name is None:
+            name = "{}:{}".format(path, lineno)
+
+        yield str(name), data
+
+
+def _iter_raw_members(path, content_key, name_key):
+    stream, handle = _open_decompressed(path)
+
+    with handle, stream:
+        head = stream.read(512)
+
+        if _is_tar_header(head):
+            # Streaming mode reads the members in order without seeking
+            for member in _iter_tar(
+                io.BufferedReader(_Prefixed(head, stream))
+            ):
+                yield member
+        elif _strip_compression_suffix(path).endswith(".jsonl"):
+            for member in _iter_jsonl(
+                path,
+                io.BufferedReader(_Prefixed(head, stream)),
+                content_key,
+                name_key,
+            ):
+                yield member
+        else:
+            yield path, head + stream.read()
+
+
+def iter_archive(
+    path,
+    only_valid=False,
+    lazy=True,
+    seen=None,
+    content_key="fstab",
+    name_key="name",
+):
+    """
+    Reads fstab snapshots from an archive, skipping the parsing of contents
+    that were already seen.
+
+    Invalid lines do not stop the reading, they are reported in
+    :attr:`ArchiveMember.invalid_lines` instead.
+
+    :param path: Path to a tar archive, JSON lines file or fstab file
+    :type path: str
+
+    :param only_valid:
+        Skip the entries that do not actually mount. See
+        :meth:`Fstab.read_string`.
+    :type only_valid: bool
+
+    :param lazy:
+        Parse entries as :class:`LazyEntry` objects. See
+        :meth:`Fstab.read_string`.
+    :type lazy: bool
+
+    :param seen:
+        Member names by content digest. Pass the same dict to several calls
+        to deduplicate snapshots across archives. It is updated with the new
+        snapshots.
+    :type seen: dict[str, str]
+
+    :param content_key: Field containing the fstab in JSON lines records
+    :type content_key: str
+
+    :param name_key: Field containing the snapshot name in JSON lines records
+    :type name_key: str
+
+    :return: One ArchiveMember per snapshot, in archive order.
+    :rtype: Iterator[ArchiveMember]
+
+    :raises ValueError:
+        If a JSON lines record has no content or its content is not a string
+        of valid text, or the file is compressed with zstd and the standard
+        library does not support it.
+    """
+    if seen is None:
+        seen = {}
+
+    for name, data in _iter_raw_members(path, content_key, name_key):
+        digest = hashlib.sha256(data).hexdigest()
+
+        first = seen.get(digest)
+        if first is not None:
+            yield ArchiveMember(name, digest, duplicate_of=first)
+            continue
+
+        seen[digest] = name
+
+        lines = parse_lines(data.decode("utf-8", "surrogateescape"), lazy)
+        fstab = Fstab().read_lines(lines, only_valid)
+
+        yield ArchiveMember(
+            name,
+            digest,
+            fstab,
+            invalid_lines=[line for line in lines if not line],
+        )
@@ -0,0 +1,192 @@
+"""
+Command line interface, run with ``python -m pyfstab``.
+
+Arguments are parsed by hand instead of with argparse, because importing
+argparse takes longer than reading a typical fstab file and the CLI is meant
+to be called from boot-time hooks.
+"""
+import sys
+
+from .entry import InvalidFstabLine
+from .fstab import Fstab
+from .lines import parse_lines
+
+USAGE = """\
+usage: python -m pyfstab query [--dir DIR] [--type TYPE] [--device DEVICE]
+                               [--field FIELD] FILE
+       python -m pyfstab validate FILE
+       python -m pyfstab format [--aligned] FILE
+
+Use - as FILE to read from standard input.
+
+commands:
+  query     print the entries matching all of the given filters
+  validate  print the invalid lines, exit with status 1 if there are any
+  format    print the file in normalized form
+
+options:
+  --dir DIR        entry mounted at DIR (the last one, as the system does)
+  --type TYPE      entries with filesystem type TYPE
+  --device DEVICE  entries for device DEVICE (e.g. UUID=1234)
+  --field FIELD    print only FIELD (device, dir, type, options, dump, fsck,
+                   device_tag_type or device_tag_value) of the entries
+  --aligned        line up the columns
+"""
+
+_FIELDS = {
+    "device",
+    "dir",
+    "type",
+    "options",
+    "dump",
+    "fsck",
+    "device_tag_type",
+    "device_tag_value",
+}
+
+
+class _UsageError(Exception):
+    pass
+
+
+def _parse_args(argv, value_options, flag_options):
+    # Returns (options, path), options containing only the given ones
+    options = {}
+    path = None
+
+    args = iter(argv)
+    for arg in args:
+        if arg in value_options:
+            value = next(args, None)
+            if value is None:
+                raise _UsageError("{} requires a value".format(arg))
+            options[arg[2:]] = value
+        elif arg in flag_options:
+            options[arg[2:]] = True
+        elif arg.startswith("--"):
+            raise _UsageError("unknown option {}".format(arg))
+        elif path is None:
+            path = arg
+        else:
+            raise _UsageError("unexpected argument {}".format(arg))
+
+    if path is None:
+        raise _UsageError("FILE is required")
+
+    return options, path
+
+
+def _read(path):
+    if path == "-":
+        return sys.stdin.read()
+
+    with open(path, "r") as handle:
+        return handle.read()
+
+
+def _query(argv, out):
+    options, path = _parse_args(
+        argv, {"--dir", "--type", "--device", "--field"}, set()
+    )
+
+    field = options.get("field")
+    if field is not None and field not in _FIELDS:
+        raise _UsageError("unknown field {}".format(field))
+
+    fstab = Fstab().read_string(_read(path), lazy=True)
+
+    if "dir" in options:
+        # Only the last entry for a directory is mounted by the system
+        entries = [e for e in fstab.entries if e.dir == options["dir"]][-1:]
+    else:
+        entries = fstab.entries
+
+    if "type" in options:
+        entries = [e for e in entries if e.type == options["type"]]
+
+    if "device" in options:
+        entries = [e for e in entries if e.device == options["device"]]
+
+    for entry in entries:
+        if field is None:
+            out.write("{}\n".format(entry))
+        else:
+            value = getattr(entry, field)
+            out.write("{}\n".format("" if value is None else value))
+
+    return 0 if entries else 1
+
+
+def _validate(argv, out):
+    _, path = _parse_args(argv, set(), set())
+
+    status = 0
+    for line in parse_lines(_read(path), lazy=True):
+        if not line:
+            out.write("{}:{}: {}\n".format(path, line.lineno, line.reason))
+            status = 1
+
+    return status
+
+
+def _format(argv, out):
+    options, path = _parse_args(argv, set(), {"--aligned"})
+
+    fstab = Fstab().read_string(_read(path), lazy=True)
+    formatted = fstab.write_string(options.get("aligned", False))
+
+    if formatted:
+        out.write(formatted + "\n")
+
+    return 0
+
+
+_COMMANDS = {"query": _query, "validate": _validate, "format": _format}
+
+
+def main(argv=None, out=None, err=None):
+    """
+    Runs the command line interface.
+
+    :param argv: Arguments without the program name (default: sys.argv[1:])
+    :type argv: list[str]
+
+    :param out: Output handle (default: sys.stdout)
+    :type out: file
+
+    :param err: Error output handle (default: sys.stderr)
+    :type err: file
+
+    :return: Exit status. 0 on success, 1 if the file is invalid or a query
+        matches nothing, 2 on usage errors.
+    :rtype: int
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if out is None:
+        out = sys.stdout
+    if err is None:
+        err = sys.stderr
+
+    if not argv or argv[0] in {"-h", "--help"}:
+        (out if argv else err).write(USAGE)
+        return 0 if argv else 2
+
+    command = _COMMANDS.get(argv[0])
+    if command is None:
+        err.write(USAGE)
+        err.write("\npyfstab: error: unknown command {}\n".format(argv[0]))
+        return 2
+
+    try:
+        return command(argv[1:], out)
+    except _UsageError as e:
+        err.write(USAGE)
+        err.write("\npyfstab: error: {}\n".format(e))
+        return 2
+    except OSError as e:
+        err.write("pyfstab: error: {}\n".format(e))
+        return 1
+    except (InvalidFstabLine, ValueError) as e:
+        err.write("pyfstab: error: invalid fstab file: {}\n".format(e))
+        return 1
@@ -1,6 +1,3 @@
-import re
-
-
 class InvalidEntry(Exception):
     """
     Raised when a string cannot be generated because of the Entry is invalid.
@@ -19,16 +16,102 @@ _valid_tag_types = {"LABEL", "UUID", "PARTLABEL", "PARTUUID", "ID"}
 
 
 def _split_device_string(string):
-    try:
-        tag_type, tag_value = string.split("=", 1)
+    tag_type, separator, tag_value = string.partition("=")
 
-        if tag_type in _valid_tag_types:
-            return (tag_type, tag_value)
-        else:
-            return (None, string)
+    if separator and tag_type in _valid_tag_types:
+        return (tag_type, tag_value)
+    else:
+        return (None, string)
+
+
+def _entry_from_fields(_device, _dir, _type, _options, _dump, _fsck):
+    # Builds a valid Entry without going through the setters. The fields must
+    # already be validated by the caller.
+    entry = Entry.__new__(Entry)
+
+    if isinstance(_device, str):
+        (
+            entry._device_tag_type,
+            entry._device_tag_value,
+        ) = _split_device_string(_device)
+    else:
+        entry._device_tag_type, entry._device_tag_value = _device
+        _device = "{}={}".format(*_device)
+
+    entry._device = _device
+    entry.dir = _dir
+    entry.type = _type
+    entry.options = _options
+    entry.dump = _dump
+    entry.fsck = _fsck
+    entry.valid = True
+
+    return entry
+
+
+def _lazy_entry_from_fields(_device, _dir, _type, _options, _dump, _fsck):
+    # Builds a valid LazyEntry from fields returned by _split_line
+    entry = LazyEntry.__new__(LazyEntry)
+    entry._read_fields(_device, _dir, _type, _options, _dump, _fsck)
+    entry.valid = True
+
+    return entry
+
+
+# Kinds of lines, see ParsedLine
+_LINE_ENTRY = "entry"
+_LINE_COMMENT = "comment"
+_LINE_BLANK = "blank"
+_LINE_MALFORMED = "malformed"
+_LINE_BAD_INT = "bad_int"
 
+
+def _bad_int(name, value):
+    try:
+        int(value)
     except ValueError:
-        return (None, string)
+        return "{} is not an integer: {!r}".format(name, value)
+
+    return None
+
+
+def _split_line(line):
+    # Classifies a single line without raising. Returns (kind, fields,
+    # reason), where fields is the list of the 6 fields of entry lines and
+    # reason tells why malformed and bad_int lines are invalid.
+    #
+    # Dump and fsck are left as strings when they consist of decimal digits
+    # only, as those always convert to int and can be converted later.
+    # Anything else (signs, underscores, garbage) is converted here.
+    line = line.strip()
+
+    if not line:
+        return (_LINE_BLANK, None, None)
+
+    if line[0] == "#":
+        return (_LINE_COMMENT, None, None)
+
+    fields = line.split()
+
+    if len(fields) != 6:
+        return (
+            _LINE_MALFORMED,
+            None,
+            "expected 6 fields, got {}".format(len(fields)),
+        )
+
+    _dump = fields[4]
+    _fsck = fields[5]
+
+    if not (_dump.isdecimal() and _fsck.isdecimal()):
+        reason = _bad_int("dump", _dump) or _bad_int("fsck", _fsck)
+        if reason is not None:
+            return (_LINE_BAD_INT, None, reason)
+
+        fields[4] = int(_dump)
+        fields[5] = int(_fsck)
+
+    return (_LINE_ENTRY, fields, None)
 
 
 class Entry:
@@ -188,28 +271,23 @@ class Entry:
         :rtype: Entry
 
         :raises InvalidEntry: If the data in the string cannot be parsed.
-        """
-        line = line.strip()
-        if line and not line[0] == "#":
-            parts = re.split(r"\s+", line)
 
-            if len(parts) == 6:
-                [_device, _dir, _type, _options, _dump, _fsck] = parts
+        :raises InvalidFstabLine:
+            If the line does not have exactly 6 fields.
 
-                _dump = int(_dump)
-                _fsck = int(_fsck)
+        :raises ValueError: If the dump or fsck field is not an integer.
+        """
+        kind, fields, reason = _split_line(line)
 
-                self.device = _device
-                self.dir = _dir
-                self.type = _type
-                self.options = _options
-                self.dump = _dump
-                self.fsck = _fsck
+        if kind == _LINE_ENTRY:
+            self._read_fields(*fields)
 
-                self.valid = True
-                return self
-            else:
-                raise InvalidFstabLine()
+            self.valid = True
+            return self
+        elif kind == _LINE_MALFORMED:
+            raise InvalidFstabLine(reason)
+        elif kind == _LINE_BAD_INT:
+            raise ValueError(reason)
 
         self.device = None
         self.dir = None
@@ -222,6 +300,15 @@ class Entry:
 
         raise InvalidEntry("Entry cannot be parsed")
 
+    def _read_fields(self, _device, _dir, _type, _options, _dump, _fsck):
+        # Sets the fields returned by _split_line
+        self.device = _device
+        self.dir = _dir
+        self.type = _type
+        self.options = _options
+        self.dump = int(_dump)
+        self.fsck = int(_fsck)
+
     def write_string(self):
         """
         Formats the Entry into fstab entry line.
@@ -255,3 +342,139 @@ class Entry:
             return "<Entry {}>".format(str(self))
         except InvalidEntry:
             return "<Entry Invalid>"
+
+
+class LazyEntry(Entry):
+    """
+    Entry that defers decoding of its fields until they are accessed.
+
+    When parsed with :meth:`read_string`, the line is only split into its
+    fields. The device tag is split and dump/fsck are converted to integers
+    on first access and cached afterwards. Whether a line is valid, and
+    which exceptions parsing raises, is the same as with :class:`Entry`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Raw, not yet decoded field strings (None when already decoded)
+        self._raw_device = None
+        self._raw_dump = None
+        self._raw_fsck = None
+
+        super().__init__(*args, **kwargs)
+
+    def _decode_device(self):
+        if self._raw_device is not None:
+            (
+                self._device_tag_type,
+                self._device_tag_value,
+            ) = _split_device_string(self._raw_device)
+            self._raw_device = None
+
+    @property
+    def device(self):
+        """
+        :return: device part string (e.g. "UUID=1234")
+        """
+        return self._device
+
+    @device.setter
+    def device(self, value):
+        """
+        :param value: new device string or tuple/list (e.g. "ID=123"
+            or ("ID", "123"))
+        :type value: Union[str, tuple, list]
+        """
+        self._raw_device = None
+        Entry.device.fset(self, value)
+
+    @property
+    def device_tag_type(self):
+        """
+        :return: device tag's type part string (e.g. "UUID" in "UUID=1234")
+        """
+        self._decode_device()
+        return self._device_tag_type
+
+    @device_tag_type.setter
+    def device_tag_type(self, value):
+        """
+        :param value: new device tag's type part (e.g. "UUID")
+        :type value: str
+        """
+        self.device = (value, self.device_tag_value)
+
+    @property
+    def device_tag_value(self):
+        """
+        :return: device tag's value part string (e.g. "1234" in "UUID=1234")
+        """
+        self._decode_device()
+        return self._device_tag_value
+
+    @device_tag_value.setter
+    def device_tag_value(self, value):
+        """
+        :param value: new device tag's value part (e.g. "123" in "ID=123")
+        :type value: str
+        """
+        self.device = (self.device_tag_type, value)
+
+    @property
+    def dump(self):
+        """
+        :return: dump field (5th parameter in the fstab entry)
+        """
+        if self._raw_dump is not None:
+            self._dump = int(self._raw_dump)
+            self._raw_dump = None
+        return self._dump
+
+    @dump.setter
+    def dump(self, value):
+        """
+        :param value: new dump field
+        :type value: int
+        """
+        self._raw_dump = None
+        self._dump = value
+
+    @property
+    def fsck(self):
+        """
+        :return: fsck field (6th parameter in the fstab entry)
+        """
+        if self._raw_fsck is not None:
+            self._fsck = int(self._raw_fsck)
+            self._raw_fsck = None
+        return self._fsck
+
+    @fsck.setter
+    def fsck(self, value):
+        """
+        :param value: new fsck field
+        :type value: int
+        """
+        self._raw_fsck = None
+        self._fsck = value
+
+    def _read_fields(self, _device, _dir, _type, _options, _dump, _fsck):
+        # Stores the fields returned by _split_line without decoding them
+        self._device = _device
+        self._device_tag_type = None
+        self._device_tag_value = None
+        self._raw_device = _device
+        self.dir = _dir
+        self.type = _type
+        self.options = _options
+
+        if isinstance(_dump, str):
+            self._raw_dump = _dump
+            self._dump = None
+        else:
+            self.dump = _dump
+
+        if isinstance(_fsck, str):
+            self._raw_fsck = _fsck
+            self._fsck = None
+        else:
+            self.fsck = _fsck
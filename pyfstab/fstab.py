@@ -1,5 +1,17 @@
-from .entry import Entry, InvalidEntry
-from collections import defaultdict
+from .entry import InvalidEntry, InvalidFstabLine, _entry_from_fields
+from .lines import ParsedLine, parse_lines
+from .snapshot import FstabSnapshot
+
+
+class _ListIndex(dict):
+    # Same behaviour as defaultdict(list) without importing collections,
+    # which noticeably slows down the startup of short-lived processes
+
+    __slots__ = ()
+
+    def __missing__(self, key):
+        value = self[key] = []
+        return value
 
 
 class Fstab:
@@ -28,7 +40,7 @@ class Fstab:
         self.entries = []
 
         # A single device can have multiple mountpoints
-        self.entries_by_device = defaultdict(list)
+        self.entries_by_device = _ListIndex()
 
         # If multiple devices have same mountpoint, only the last entry in the
         # fstab file is taken into consideration
@@ -36,9 +48,9 @@ class Fstab:
 
         # And the most obvious one, many entries can have mountpoints of same
         # type
-        self.entries_by_type = defaultdict(list)
+        self.entries_by_type = _ListIndex()
 
-    def read_string(self, data, only_valid=False):
+    def read_string(self, data, only_valid=False, lazy=False, strict=True):
         """
         Parses entries from a data string
 
@@ -51,37 +63,250 @@ class Fstab:
             directory X, the A mount to X is undone by the system.
         :type only_valid: bool
 
+        :param lazy:
+            Parse entries as :class:`LazyEntry` objects, which decode the
+            device tag and dump/fsck fields only when they are accessed.
+        :type lazy: bool
+
+        :param strict:
+            Raise on invalid lines. If False, invalid lines are skipped. Use
+            :func:`parse_lines` and :meth:`read_lines` to also find out which
+            lines were invalid and why.
+        :type strict: bool
+
+        :return: self
+        :rtype: Fstab
+
+        :raises InvalidFstabLine:
+            If strict and a line does not have exactly 6 fields.
+
+        :raises ValueError:
+            If strict and the dump or fsck field of a line is not an integer.
+        """
+        lines = parse_lines(data, lazy)
+
+        if strict:
+            # Report the last invalid line, as the parser used to go through
+            # the lines from the end
+            for line in reversed(lines):
+                if line.kind == ParsedLine.MALFORMED:
+                    raise InvalidFstabLine(
+                        "Line {}: {}".format(line.lineno, line.reason)
+                    )
+                elif line.kind == ParsedLine.BAD_INT:
+                    raise ValueError(
+                        "Line {}: {}".format(line.lineno, line.reason)
+                    )
+
+        return self.read_lines(lines, only_valid)
+
+    def read_lines(self, lines, only_valid=False):
+        """
+        Adds the entries of lines classified by :func:`parse_lines`. Lines
+        that are not entries are ignored.
+
+        :param lines: Classified lines in file order
+        :type lines: list[ParsedLine]
+
+        :param only_valid:
+            Skip the entries that do not actually mount. For example, if device
+            A is mounted to directory X and later device B is mounted to
+            directory X, the A mount to X is undone by the system.
+        :type only_valid: bool
+
         :return: self
         :rtype: Fstab
         """
-        for line in reversed(data.splitlines()):
-            try:
-                entry = Entry().read_string(line)
-                if entry and (
-                    not only_valid or entry.dir not in self.entry_by_dir
+        entry_by_dir = self.entry_by_dir
+
+        # Entries are gone through from the end so that with only_valid the
+        # last entry for each directory wins
+        entries = []
+        for line in reversed(lines):
+            entry = line.entry
+            if entry is not None and (
+                not only_valid or entry.dir not in entry_by_dir
+            ):
+                entries.append(entry)
+                entry_by_dir[entry.dir] = entry
+
+        entries.reverse()
+
+        # Entries read later are placed before the existing ones
+        by_device = _ListIndex()
+        by_type = _ListIndex()
+        for entry in entries:
+            by_device[entry.device].append(entry)
+            by_type[entry.type].append(entry)
+
+        self.entries[0:0] = entries
+        for device, device_entries in by_device.items():
+            self.entries_by_device[device][0:0] = device_entries
+        for type_, type_entries in by_type.items():
+            self.entries_by_type[type_][0:0] = type_entries
+
+        return self
+
+    def add_rows(self, rows):
+        """
+        Adds entries from field tuples. Unlike appending to :attr:`entries`,
+        this also updates the indexes.
+
+        All rows are validated before any of them is added, so either every
+        row is added or none of them is. The entries are built without going
+        through the Entry setters, which is faster than creating them one by
+        one with Entry().
+
+        :param rows:
+            Iterable of (device, dir, type, options, dump, fsck) tuples or
+            lists. Device can also be a (type, value) tuple/list as with
+            Entry.
+        :type rows: Iterable[Union[tuple, list]]
+
+        :return: self
+        :rtype: Fstab
+
+        :raises InvalidEntry: If any of the rows is not a valid entry.
+        """
+        entries = []
+        invalid = []
+
+        for index, row in enumerate(rows):
+            if (
+                isinstance(row, (tuple, list))
+                and len(row) == 6
+                and None not in row
+            ):
+                device = row[0]
+                if isinstance(device, str) or (
+                    isinstance(device, (tuple, list)) and len(device) == 2
                 ):
-                    self.entries.insert(0, entry)
-                    self.entries_by_device[entry.device].insert(0, entry)
-                    self.entry_by_dir[entry.dir] = entry
-                    self.entries_by_type[entry.type].insert(0, entry)
-            except InvalidEntry:
-                pass
+                    # Once a row is invalid, nothing is added, so building
+                    # the rest of the entries would be wasted work
+                    if not invalid:
+                        entries.append(_entry_from_fields(*row))
+                    continue
+
+            invalid.append(str(index))
+
+        if invalid:
+            raise InvalidEntry(
+                "Rows cannot be added: {}".format(", ".join(invalid))
+            )
+
+        self.entries.extend(entries)
+
+        # Plain dict lookups, so that __missing__ isn't called in Python for
+        # every new device and type
+        entries_by_device = self.entries_by_device
+        entry_by_dir = self.entry_by_dir
+        entries_by_type = self.entries_by_type
+        for entry in entries:
+            device_entries = entries_by_device.get(entry._device)
+            if device_entries is None:
+                entries_by_device[entry._device] = [entry]
+            else:
+                device_entries.append(entry)
+
+            entry_by_dir[entry.dir] = entry
+
+            type_entries = entries_by_type.get(entry.type)
+            if type_entries is None:
+                entries_by_type[entry.type] = [entry]
+            else:
+                type_entries.append(entry)
 
         return self
 
-    def write_string(self):
+    def add_columns(self, devices, dirs, types, options, dumps, fscks):
+        """
+        Adds entries from columns of fields. See :meth:`add_rows`.
+
+        :param devices: Devices of the entries
+        :type devices: Iterable[Union[str, tuple, list]]
+
+        :param dirs: Directories of the entries
+        :type dirs: Iterable[str]
+
+        :param types: Filesystem types of the entries
+        :type types: Iterable[str]
+
+        :param options: Mount options of the entries
+        :type options: Iterable[str]
+
+        :param dumps: Dump fields of the entries
+        :type dumps: Iterable[int]
+
+        :param fscks: Fsck fields of the entries
+        :type fscks: Iterable[int]
+
+        :return: self
+        :rtype: Fstab
+
+        :raises InvalidEntry:
+            If the columns have different lengths or any of the rows is not
+            a valid entry.
+        """
+        columns = [
+            list(column)
+            for column in (devices, dirs, types, options, dumps, fscks)
+        ]
+
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise InvalidEntry(
+                "Columns have different lengths: {}".format(
+                    ", ".join(str(len(column)) for column in columns)
+                )
+            )
+
+        return self.add_rows(zip(*columns))
+
+    def write_string(self, aligned=False):
         """
         Formats entries into a string.
 
+        :param aligned:
+            Pad the fields so that the columns line up, like in hand-written
+            fstab files.
+        :type aligned: bool
+
         :return: Formatted fstab file.
         :rtype: str
 
         :raises InvalidEntry:
             A string cannot be generated because one of the entries is invalid.
         """
-        return "\n".join(str(entry) for entry in self.entries)
-
-    def read_file(self, handle, only_valid=False):
+        if not aligned:
+            return "\n".join(str(entry) for entry in self.entries)
+
+        rows = []
+        for entry in self.entries:
+            if not entry:
+                raise InvalidEntry("Entry cannot be formatted")
+
+            rows.append(
+                (
+                    str(entry.device),
+                    str(entry.dir),
+                    str(entry.type),
+                    str(entry.options),
+                    str(entry.dump),
+                    str(entry.fsck),
+                )
+            )
+
+        if not rows:
+            return ""
+
+        widths = [max(len(row[i]) for row in rows) for i in range(5)]
+        line_format = " ".join(
+            ["{{:<{}}}".format(width) for width in widths] + ["{}"]
+        )
+
+        return "\n".join(line_format.format(*row) for row in rows)
+
+    def read_file(self, handle, only_valid=False, lazy=False, strict=True):
         """
         Parses entries from a file
 
@@ -94,27 +319,56 @@ class Fstab:
             directory X, the A mount to X is undone by the system.
         :type only_valid: bool
 
+        :param lazy:
+            Parse entries as :class:`LazyEntry` objects, which decode the
+            device tag and dump/fsck fields only when they are accessed.
+        :type lazy: bool
+
+        :param strict:
+            Raise on invalid lines. If False, invalid lines are skipped.
+        :type strict: bool
+
         :return: self
         :rtype: Fstab
+
+        :raises InvalidFstabLine:
+            If strict and a line does not have exactly 6 fields.
+
+        :raises ValueError:
+            If strict and the dump or fsck field of a line is not an integer.
         """
-        self.read_string(handle.read(), only_valid)
+        self.read_string(handle.read(), only_valid, lazy, strict)
 
         return self
 
-    def write_file(self, handle):
+    def write_file(self, handle, aligned=False):
         """
         Parses entries in data string
 
         :param path: File handle
         :type path: file
 
+        :param aligned:
+            Pad the fields so that the columns line up, like in hand-written
+            fstab files.
+        :type aligned: bool
+
         :return: self
         :rtype: Fstab
         """
-        handle.write(str(self))
+        handle.write(self.write_string(aligned))
 
         return self
 
+    def snapshot(self):
+        """
+        Creates an immutable snapshot of the current entries and indexes.
+
+        :return: Snapshot that can be shared between threads
+        :rtype: FstabSnapshot
+        """
+        return FstabSnapshot(self)
+
     def __bool__(self):
         return len(self.entries) > 0
 
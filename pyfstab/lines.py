@@ -0,0 +1,107 @@
+from .entry import (
+    _LINE_BAD_INT,
+    _LINE_BLANK,
+    _LINE_COMMENT,
+    _LINE_ENTRY,
+    _LINE_MALFORMED,
+    _entry_from_fields,
+    _lazy_entry_from_fields,
+    _split_line,
+)
+
+
+class ParsedLine:
+    """
+    Classification of a single line of an fstab file.
+
+    :var lineno:
+        (int) -
+        Line number, starting from 1.
+
+    :var kind:
+        (str) -
+        One of ParsedLine.ENTRY, COMMENT, BLANK, MALFORMED or BAD_INT.
+
+    :var line:
+        (str) -
+        The line as it was in the file.
+
+    :var entry:
+        (Entry or None) -
+        Parsed entry for ENTRY lines, None otherwise.
+
+    :var reason:
+        (str or None) -
+        Why the line could not be parsed for MALFORMED and BAD_INT lines,
+        None otherwise.
+    """
+
+    ENTRY = _LINE_ENTRY
+    COMMENT = _LINE_COMMENT
+    BLANK = _LINE_BLANK
+
+    #: Line does not have exactly 6 fields. The system cannot process
+    #: the rest of the file either.
+    MALFORMED = _LINE_MALFORMED
+
+    #: Dump or fsck field is not an integer
+    BAD_INT = _LINE_BAD_INT
+
+    __slots__ = ("lineno", "kind", "line", "entry", "reason")
+
+    def __init__(self, lineno, kind, line, entry=None, reason=None):
+        self.lineno = lineno
+        self.kind = kind
+        self.line = line
+        self.entry = entry
+        self.reason = reason
+
+    def __bool__(self):
+        return self.kind not in {ParsedLine.MALFORMED, ParsedLine.BAD_INT}
+
+    def __repr__(self):
+        if self.reason is not None:
+            return "<ParsedLine {} {}: {}>".format(
+                self.lineno, self.kind, self.reason
+            )
+
+        return "<ParsedLine {} {}>".format(self.lineno, self.kind)
+
+
+def parse_lines(data, lazy=False):
+    """
+    Classifies every line of fstab data without raising on invalid lines.
+
+    :param data: Contents of the fstab file
+    :type data: str
+
+    :param lazy:
+        Create :class:`LazyEntry` objects instead of :class:`Entry` objects.
+    :type lazy: bool
+
+    :return: One ParsedLine per line, in file order.
+    :rtype: list[ParsedLine]
+    """
+    ENTRY = ParsedLine.ENTRY
+
+    result = []
+    append = result.append
+
+    for lineno, line in enumerate(data.splitlines(), 1):
+        kind, fields, reason = _split_line(line)
+
+        if kind != ENTRY:
+            append(ParsedLine(lineno, kind, line, reason=reason))
+            continue
+
+        if lazy:
+            entry = _lazy_entry_from_fields(*fields)
+        else:
+            fields[4] = int(fields[4])
+            fields[5] = int(fields[5])
+
+            entry = _entry_from_fields(*fields)
+
+        append(ParsedLine(lineno, kind, line, entry))
+
+    return result
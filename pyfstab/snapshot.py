@@ -0,0 +1,223 @@
+from .entry import Entry
+from types import MappingProxyType
+
+
+class FrozenEntry(Entry):
+    """
+    Immutable copy of an Entry. Any attempt to modify it raises
+    AttributeError.
+    """
+
+    def __init__(self, entry):
+        """
+        :param entry: Entry to copy
+        :type entry: Entry
+        """
+        setattr_ = object.__setattr__
+        setattr_(self, "_device", entry.device)
+        setattr_(self, "_device_tag_type", entry.device_tag_type)
+        setattr_(self, "_device_tag_value", entry.device_tag_value)
+        setattr_(self, "dir", entry.dir)
+        setattr_(self, "type", entry.type)
+        setattr_(self, "options", entry.options)
+        setattr_(self, "dump", entry.dump)
+        setattr_(self, "fsck", entry.fsck)
+        setattr_(self, "valid", entry.valid)
+
+    def read_string(self, line):
+        raise AttributeError("FrozenEntry is immutable")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenEntry is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenEntry is immutable")
+
+
+def _freeze(entry, frozen):
+    # Frozen copies by id of the original entry, so that an entry that is in
+    # several indexes is copied only once
+    result = frozen.get(id(entry))
+    if result is None:
+        result = frozen[id(entry)] = FrozenEntry(entry)
+    return result
+
+
+def _freeze_index(index, frozen):
+    return {
+        key: tuple(_freeze(entry, frozen) for entry in entries)
+        for key, entries in index.items()
+    }
+
+
+def _restore_snapshot(
+    entries, entries_by_device, entry_by_dir, entries_by_type
+):
+    snapshot = FstabSnapshot.__new__(FstabSnapshot)
+    snapshot._set(entries, entries_by_device, entry_by_dir, entries_by_type)
+    return snapshot
+
+
+class FstabSnapshot:
+    """
+    Immutable, fully built view of an Fstab. Safe to share between threads
+    without locking.
+
+    Unlike in Fstab, the indexes are read-only mappings and missing keys
+    raise KeyError instead of returning an empty list.
+
+    :var entries:
+        (tuple[FrozenEntry]) -
+        Entries in file order.
+
+    :var entries_by_device:
+        (Mapping[str, tuple[FrozenEntry]]) -
+        Fstab entries by device.
+
+    :var entry_by_dir:
+        (Mapping[str, FrozenEntry]) -
+        Fstab entry by directory.
+
+    :var entries_by_type:
+        (Mapping[str, tuple[FrozenEntry]]) -
+        Fstab entries by type.
+    """
+
+    __slots__ = (
+        "entries",
+        "entries_by_device",
+        "entry_by_dir",
+        "entries_by_type",
+    )
+
+    def __init__(self, fstab):
+        """
+        :param fstab: Fstab to take the snapshot of
+        :type fstab: Fstab
+        """
+        # The indexes may contain entries that are no longer in the entries
+        # list (e.g. when the list was filtered), those are frozen as well
+        frozen = {}
+
+        self._set(
+            tuple(_freeze(entry, frozen) for entry in fstab.entries),
+            _freeze_index(fstab.entries_by_device, frozen),
+            {
+                key: _freeze(entry, frozen)
+                for key, entry in fstab.entry_by_dir.items()
+            },
+            _freeze_index(fstab.entries_by_type, frozen),
+        )
+
+    def _set(self, entries, entries_by_device, entry_by_dir, entries_by_type):
+        setattr_ = object.__setattr__
+        setattr_(self, "entries", entries)
+        setattr_(
+            self, "entries_by_device", MappingProxyType(entries_by_device)
+        )
+        setattr_(self, "entry_by_dir", MappingProxyType(entry_by_dir))
+        setattr_(self, "entries_by_type", MappingProxyType(entries_by_type))
+
+    def write_string(self):
+        """
+        Formats entries into a string.
+
+        :return: Formatted fstab file.
+        :rtype: str
+
+        :raises InvalidEntry:
+            A string cannot be generated because one of the entries is invalid.
+        """
+        return "\n".join(str(entry) for entry in self.entries)
+
+    def __reduce__(self):
+        # Supports copy and pickle, which cannot handle the read-only
+        # mappings themselves
+        return (
+            _restore_snapshot,
+            (
+                self.entries,
+                dict(self.entries_by_device),
+                dict(self.entry_by_dir),
+                dict(self.entries_by_type),
+            ),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FstabSnapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FstabSnapshot is immutable")
+
+    def __bool__(self):
+        return len(self.entries) > 0
+
+    def __str__(self):
+        return self.write_string()
+
+    def __repr__(self):
+        return "<FstabSnapshot [{} entries]>".format(len(self.entries))
+
+
+class SnapshotPublisher:
+    """
+    Holds the current FstabSnapshot for concurrent readers.
+
+    Readers only read :attr:`current`, which is a single attribute lookup and
+    never needs a lock. Writers build the next snapshot separately and then
+    publish it, replacing the reference in one step.
+
+    :var current:
+        (FstabSnapshot or None) -
+        Latest published snapshot.
+    """
+
+    def __init__(self, snapshot=None):
+        """
+        :param snapshot: Initially published snapshot
+        :type snapshot: FstabSnapshot
+        """
+        # Imported here so that importing pyfstab does not load threading
+        from threading import Lock
+
+        self.current = snapshot
+
+        # Only serializes writers, readers never take it
+        self._lock = Lock()
+
+    def publish(self, snapshot):
+        """
+        Replaces the current snapshot.
+
+        :param snapshot: New snapshot
+        :type snapshot: FstabSnapshot
+
+        :return: Previously published snapshot
+        :rtype: FstabSnapshot or None
+        """
+        with self._lock:
+            previous = self.current
+            self.current = snapshot
+
+        return previous
+
+    def swap(self, expected, snapshot):
+        """
+        Replaces the current snapshot only if it still is `expected`.
+
+        :param expected: Snapshot the new one was derived from
+        :type expected: FstabSnapshot or None
+
+        :param snapshot: New snapshot
+        :type snapshot: FstabSnapshot
+
+        :return: Whether the snapshot was published
+        :rtype: bool
+        """
+        with self._lock:
+            if self.current is not expected:
+                return False
+
+            self.current = snapshot
+
+        return True
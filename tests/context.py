@@ -5,4 +5,8 @@ sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 )
 
-from pyfstab import Fstab, Entry, InvalidEntry, InvalidFstabLine
+from pyfstab import Fstab, Entry, LazyEntry, InvalidEntry, InvalidFstabLine
+from pyfstab import FrozenEntry, FstabSnapshot, SnapshotPublisher
+from pyfstab import ParsedLine, parse_lines
+from pyfstab.cli import main
+from pyfstab.archive import iter_archive
@@ -0,0 +1,151 @@
+from context import iter_archive
+import bz2
+import gzip
+import io
+import json
+import lzma
+import pytest
+import tarfile
+
+day1 = "UUID=1234567890 / ext4 rw,relatime 0 1\n"
+day2 = day1 + "UUID=1231231231 none swap defaults,pri=-2 0 0\n"
+messy = day1 + "hello world\n"
+
+
+def write_tar(path, members, mode):
+    with tarfile.open(str(path), mode) as tar:
+        for name, data in members:
+            data = data.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize(
+    "suffix,mode",
+    [
+        (".tar", "w"),
+        (".tar.gz", "w:gz"),
+        (".tar.xz", "w:xz"),
+        (".tar.bz2", "w:bz2"),
+    ],
+)
+def test_tar(tmp_path, suffix, mode):
+    path = tmp_path / ("snapshots" + suffix)
+    write_tar(
+        path,
+        [
+            ("host/2020-01-01", day1),
+            ("host/2020-01-02", day1),
+            ("host/2020-01-03", day2),
+            ("host/2020-01-04", messy),
+        ],
+        mode,
+    )
+
+    members = list(iter_archive(str(path)))
+
+    assert [member.name for member in members] == [
+        "host/2020-01-01",
+        "host/2020-01-02",
+        "host/2020-01-03",
+        "host/2020-01-04",
+    ]
+
+    assert len(members[0].fstab.entries) == 1
+    assert members[0].invalid_lines == []
+
+    assert members[1].fstab is None
+    assert members[1].duplicate_of == "host/2020-01-01"
+    assert members[1].digest == members[0].digest
+
+    assert str(members[2].fstab) == day2.strip()
+
+    assert len(members[3].fstab.entries) == 1
+    assert [line.lineno for line in members[3].invalid_lines] == [2]
+
+    assert repr(members[1]) == (
+        "<ArchiveMember host/2020-01-02 duplicate of host/2020-01-01>"
+    )
+    assert repr(members[2]) == "<ArchiveMember host/2020-01-03 [2 entries]>"
+
+
+def test_jsonl(tmp_path):
+    path = tmp_path / "snapshots.jsonl.xz"
+    with lzma.open(str(path), "wt") as handle:
+        handle.write(json.dumps({"name": "a", "fstab": day1}) + "\n")
+        handle.write("\n")
+        handle.write(json.dumps({"fstab": day1}) + "\n")
+        handle.write(json.dumps({"name": "c", "fstab": day2}) + "\n")
+
+    members = list(iter_archive(str(path)))
+
+    assert [member.name for member in members] == [
+        "a",
+        "{}:3".format(path),
+        "c",
+    ]
+    assert members[1].duplicate_of == "a"
+    assert len(members[2].fstab.entries) == 2
+
+
+@pytest.mark.parametrize(
+    "record,message",
+    [
+        ('{"name": "a", "data": "x"}', "record has no 'fstab' field"),
+        ('["x"]', "record has no 'fstab' field"),
+        ('{"fstab": null}', "'fstab' field is not a string"),
+        ('{"fstab": ["x"]}', "'fstab' field is not a string"),
+        ('{"fstab": "\\ud83d"}', "'fstab' field is not valid text"),
+    ],
+)
+def test_jsonl_invalid_content(tmp_path, record, message):
+    path = tmp_path / "snapshots.jsonl"
+    path.write_text(json.dumps({"fstab": day1}) + "\n" + record + "\n")
+
+    with pytest.raises(ValueError) as error:
+        list(iter_archive(str(path)))
+
+    assert str(error.value) == "{}:2: {}".format(path, message)
+
+
+def test_single_files_seen(tmp_path):
+    plain = tmp_path / "fstab"
+    plain.write_text(day2)
+
+    compressed = tmp_path / "fstab.old.gz"
+    with gzip.open(str(compressed), "wt") as handle:
+        handle.write(day2)
+
+    other = tmp_path / "fstab.older.bz2"
+    with bz2.open(str(other), "wt") as handle:
+        handle.write(day1)
+
+    seen = {}
+    members = [
+        member
+        for path in [plain, compressed, other]
+        for member in iter_archive(str(path), seen=seen)
+    ]
+
+    assert [member.name for member in members] == [
+        str(plain),
+        str(compressed),
+        str(other),
+    ]
+    assert members[1].duplicate_of == str(plain)
+    assert len(members[2].fstab.entries) == 1
+    assert len(seen) == 2
+
+
+def test_only_valid(tmp_path):
+    path = tmp_path / "fstab"
+    path.write_text(
+        "UUID=1234567890 /my/directory ext4 rw,relatime 0 1\n"
+        "UUID=1231231231 /my/directory ext4 rw,relatime 0 1\n"
+    )
+
+    (member,) = iter_archive(str(path), only_valid=True)
+
+    assert len(member.fstab.entries) == 1
+    assert member.fstab.entries[0].device == "UUID=1231231231"
@@ -0,0 +1,122 @@
+from context import main
+import io
+
+fstab_file = """
+# Hello world
+UUID=1234567890 / ext4 rw,relatime 0 1
+/dev/sdb1 /mnt/data xfs defaults,noatime 0 2
+UUID=1231231231 none swap defaults,pri=-2 0 0
+"""
+
+
+def run(tmp_path, *args, data=fstab_file):
+    path = tmp_path / "fstab"
+    path.write_text(data)
+
+    out = io.StringIO()
+    err = io.StringIO()
+    status = main(
+        [str(path) if arg == "FILE" else arg for arg in args], out, err
+    )
+
+    return status, out.getvalue(), err.getvalue()
+
+
+def test_query(tmp_path):
+    status, out, _ = run(tmp_path, "query", "--type", "xfs", "FILE")
+    assert status == 0
+    assert out == "/dev/sdb1 /mnt/data xfs defaults,noatime 0 2\n"
+
+    status, out, _ = run(
+        tmp_path, "query", "--dir", "/", "--field", "device_tag_value", "FILE"
+    )
+    assert status == 0
+    assert out == "1234567890\n"
+
+    status, out, _ = run(tmp_path, "query", "--dir", "/nothing", "FILE")
+    assert status == 1
+    assert out == ""
+
+
+def test_query_duplicate_dir(tmp_path):
+    data = (
+        "/dev/a /mnt ext4 defaults 0 2\n"
+        "/dev/b /mnt xfs defaults 0 2\n"
+        "/dev/c /srv xfs defaults 0 2\n"
+    )
+
+    status, out, _ = run(
+        tmp_path,
+        "query",
+        "--dir",
+        "/mnt",
+        "--field",
+        "device",
+        "FILE",
+        data=data,
+    )
+    assert status == 0
+    assert out == "/dev/b\n"
+
+    status, out, _ = run(
+        tmp_path,
+        "query",
+        "--dir",
+        "/mnt",
+        "--type",
+        "ext4",
+        "FILE",
+        data=data,
+    )
+    assert status == 1
+    assert out == ""
+
+
+def test_validate(tmp_path):
+    status, _, _ = run(tmp_path, "validate", "FILE")
+    assert status == 0
+
+    status, out, _ = run(
+        tmp_path, "validate", "FILE", data="hello world\n/ / a b x 0\n"
+    )
+    assert status == 1
+    assert out == (
+        "{0}:1: expected 6 fields, got 2\n"
+        "{0}:2: dump is not an integer: 'x'\n"
+    ).format(tmp_path / "fstab")
+
+
+def test_invalid_file(tmp_path):
+    status, _, err = run(tmp_path, "format", "FILE", data="hello world\n")
+    assert status == 1
+    assert err == (
+        "pyfstab: error: invalid fstab file: "
+        "Line 1: expected 6 fields, got 2\n"
+    )
+
+
+def test_format(tmp_path):
+    status, out, _ = run(tmp_path, "format", "--aligned", "FILE")
+    assert status == 0
+    assert out == (
+        "UUID=1234567890 /         ext4 rw,relatime      0 1\n"
+        "/dev/sdb1       /mnt/data xfs  defaults,noatime 0 2\n"
+        "UUID=1231231231 none      swap defaults,pri=-2  0 0\n"
+    )
+
+
+def test_usage_errors(tmp_path):
+    status, _, err = run(tmp_path, "query", "--bogus", "FILE")
+    assert status == 2
+    assert "unknown option --bogus" in err
+
+    status, _, err = run(tmp_path, "query", "--field", "size", "FILE")
+    assert status == 2
+    assert "unknown field size" in err
+
+    status, _, err = run(tmp_path, "remove", "FILE")
+    assert status == 2
+
+    status, _, err = run(tmp_path, "format")
+    assert status == 2
+    assert "FILE is required" in err
@@ -1,6 +1,10 @@
 import pytest
-from context import Fstab, Entry, InvalidFstabLine, InvalidEntry
+from context import Fstab, Entry, LazyEntry, InvalidFstabLine, InvalidEntry
+from context import FrozenEntry, FstabSnapshot, SnapshotPublisher
+from context import ParsedLine, parse_lines
+import copy
 import io
+import pickle
 
 normal_spaces = """
 UUID=1234567890 / ext4 rw,relatime 0 1
@@ -313,3 +317,376 @@ def test_entry_device_changes():
     assert entry.device is None
     assert entry.device_tag_type is None
     assert entry.device_tag_value is None
+
+
+def test_lazy_comments():
+    fstab = Fstab().read_string(comments, lazy=True)
+
+    assert len(fstab.entries) == 2
+    assert isinstance(fstab.entries[0], LazyEntry)
+
+    assert fstab.entries[0].device == "UUID=1234567890"
+    assert fstab.entries[0].device_tag_type == "UUID"
+    assert fstab.entries[0].device_tag_value == "1234567890"
+    assert fstab.entries[0].dir == "/"
+    assert fstab.entries[0].type == "ext4"
+    assert fstab.entries[0].options == "rw,relatime"
+    assert fstab.entries[0].dump == 0
+    assert fstab.entries[0].fsck == 1
+
+    assert fstab.entries[1].dir == "none"
+
+    assert str(fstab) == str(Fstab().read_string(comments))
+
+
+def test_lazy_bad_file():
+    with pytest.raises(InvalidFstabLine):
+        Fstab().read_string(bad_file, lazy=True)
+
+
+def test_lazy_entry_bad_int():
+    with pytest.raises(ValueError):
+        LazyEntry().read_string("UUID=1234567890 / ext4 rw,relatime x 1")
+
+    entry = LazyEntry().read_string("/dev/sda1 / ext4 rw,relatime -1 +1")
+
+    assert entry.dump == -1
+    assert entry.fsck == 1
+
+
+def test_lazy_entry_invalid():
+    entry = LazyEntry()
+    assert not entry
+
+    with pytest.raises(InvalidEntry):
+        entry.read_string("# Comment")
+
+    assert repr(entry) == "<Entry Invalid>"
+
+
+def test_lazy_entry_device_changes():
+    entry = LazyEntry().read_string("UUID=1234567890 / ext4 rw,relatime 0 1")
+
+    entry.device_tag_type = "LABEL"
+
+    assert entry.device == "LABEL=1234567890"
+    assert entry.device_tag_type == "LABEL"
+    assert entry.device_tag_value == "1234567890"
+
+    entry.dump = 1
+
+    assert str(entry) == "LABEL=1234567890 / ext4 rw,relatime 1 1"
+
+    entry.read_string("/dev/sda1 / ext4 rw,relatime 0 2")
+
+    assert entry.device_tag_type is None
+    assert entry.device_tag_value == "/dev/sda1"
+    assert entry.fsck == 2
+
+
+def test_snapshot():
+    fstab = Fstab().read_string(comments, lazy=True)
+    snapshot = fstab.snapshot()
+
+    assert isinstance(snapshot, FstabSnapshot)
+    assert len(snapshot.entries) == 2
+    assert isinstance(snapshot.entries[0], FrozenEntry)
+    assert str(snapshot) == str(fstab)
+
+    assert snapshot.entry_by_dir["/"] is snapshot.entries[0]
+    assert snapshot.entries_by_type["swap"] == (snapshot.entries[1],)
+    assert snapshot.entries_by_device["UUID=1234567890"] == (
+        snapshot.entries[0],
+    )
+    assert snapshot.entries[0].device_tag_type == "UUID"
+    assert snapshot.entries[0].dump == 0
+
+    # Later changes to the Fstab are not visible in the snapshot
+    fstab.entries[0].dir = "/mnt"
+    fstab.entries.pop()
+    assert snapshot.entries[0].dir == "/"
+    assert len(snapshot.entries) == 2
+
+
+def test_snapshot_immutable():
+    snapshot = Fstab().read_string(comments).snapshot()
+
+    with pytest.raises(AttributeError):
+        snapshot.entries = ()
+
+    with pytest.raises(TypeError):
+        snapshot.entry_by_dir["/mnt"] = snapshot.entries[0]
+
+    with pytest.raises(AttributeError):
+        snapshot.entries[0].dir = "/mnt"
+
+    with pytest.raises(AttributeError):
+        snapshot.entries[0].device = "UUID=1"
+
+    with pytest.raises(AttributeError):
+        snapshot.entries[0].read_string("/dev/sda1 / ext4 rw 0 1")
+
+
+def test_snapshot_filtered_entries():
+    fstab = Fstab().read_string(comments)
+    fstab.entries = [
+        entry for entry in fstab.entries if entry.type.startswith("ext")
+    ]
+
+    snapshot = fstab.snapshot()
+
+    assert [entry.dir for entry in snapshot.entries] == ["/"]
+
+    # The indexes are kept as they were in the Fstab
+    assert snapshot.entry_by_dir["/"] is snapshot.entries[0]
+    assert snapshot.entry_by_dir["none"].type == "swap"
+    assert isinstance(snapshot.entries_by_type["swap"][0], FrozenEntry)
+
+
+def test_snapshot_copy_pickle():
+    snapshot = Fstab().read_string(comments).snapshot()
+
+    for other in [
+        copy.copy(snapshot),
+        copy.deepcopy(snapshot),
+        pickle.loads(pickle.dumps(snapshot)),
+    ]:
+        assert isinstance(other, FstabSnapshot)
+        assert str(other) == str(snapshot)
+        assert other.entry_by_dir["/"] is other.entries[0]
+        assert other.entries_by_type["swap"] == (other.entries[1],)
+        assert other.entries[0].device_tag_type == "UUID"
+
+        with pytest.raises(AttributeError):
+            other.entries = ()
+
+        with pytest.raises(TypeError):
+            other.entry_by_dir["/mnt"] = other.entries[0]
+
+        with pytest.raises(AttributeError):
+            other.entries[0].dir = "/mnt"
+
+
+def test_snapshot_publisher():
+    first = Fstab().read_string(comments).snapshot()
+    second = Fstab().read_string(normal_spaces).snapshot()
+
+    publisher = SnapshotPublisher()
+    assert publisher.current is None
+
+    assert publisher.publish(first) is None
+    assert publisher.current is first
+
+    assert not publisher.swap(None, second)
+    assert publisher.current is first
+
+    assert publisher.swap(first, second)
+    assert publisher.current is second
+
+
+def test_add_rows():
+    fstab = Fstab().read_string(normal_spaces_tight)
+    fstab.add_rows(
+        [
+            ("/srv/a", "/mnt/a", "none", "bind", 0, 0),
+            (("LABEL", "data"), "/mnt/b", "ext4", "defaults", 0, 2),
+        ]
+    )
+
+    assert len(fstab.entries) == 4
+
+    assert fstab.entries[2].device == "/srv/a"
+    assert fstab.entries[2].device_tag_type is None
+    assert fstab.entries[2].device_tag_value == "/srv/a"
+    assert fstab.entries[3].device == "LABEL=data"
+    assert fstab.entries[3].device_tag_type == "LABEL"
+    assert fstab.entries[3].device_tag_value == "data"
+
+    assert fstab.entry_by_dir["/mnt/a"] is fstab.entries[2]
+    assert fstab.entries_by_type["ext4"] == [
+        fstab.entries[0],
+        fstab.entries[3],
+    ]
+    assert fstab.entries_by_device["LABEL=data"] == [fstab.entries[3]]
+
+    assert str(fstab) == (
+        normal_spaces_tight + "\n"
+        "/srv/a /mnt/a none bind 0 0\n"
+        "LABEL=data /mnt/b ext4 defaults 0 2"
+    )
+
+
+def test_add_rows_invalid():
+    fstab = Fstab()
+
+    with pytest.raises(InvalidEntry):
+        fstab.add_rows(
+            [
+                ("/srv/a", "/mnt/a", "none", "bind", 0, 0),
+                ("/srv/b", "/mnt/b", "none", "bind", 0),
+                ("/srv/c", "/mnt/c", None, "bind", 0, 0),
+            ]
+        )
+
+    assert len(fstab.entries) == 0
+    assert len(fstab.entry_by_dir) == 0
+
+
+def test_add_rows_invalid_shapes():
+    fstab = Fstab()
+
+    with pytest.raises(InvalidEntry) as error:
+        fstab.add_rows(
+            [
+                "abcdef",
+                (("UUID",), "/mnt/b", "none", "bind", 0, 0),
+                (("UUID", "1", "2"), "/mnt/c", "none", "bind", 0, 0),
+                (1234, "/mnt/d", "none", "bind", 0, 0),
+                ["/srv/e", "/mnt/e", "none", "bind", 0, 0],
+            ]
+        )
+
+    assert str(error.value) == "Rows cannot be added: 0, 1, 2, 3"
+    assert len(fstab.entries) == 0
+
+
+def test_add_columns_different_lengths():
+    fstab = Fstab()
+
+    with pytest.raises(InvalidEntry):
+        fstab.add_columns(
+            ["/srv/a", "/srv/b", "/srv/c"],
+            ["/mnt/a", "/mnt/b"],
+            ["none", "none", "none"],
+            ["bind", "bind", "bind"],
+            [0, 0, 0],
+            [0, 0, 0],
+        )
+
+    assert len(fstab.entries) == 0
+
+
+def test_add_columns():
+    fstab = Fstab().add_columns(
+        ["/srv/a", "UUID=1234"],
+        ["/mnt/a", "/"],
+        ["none", "ext4"],
+        ["bind", "rw"],
+        [0, 0],
+        [0, 1],
+    )
+
+    assert str(fstab) == "/srv/a /mnt/a none bind 0 0\nUUID=1234 / ext4 rw 0 1"
+
+
+def test_write_aligned():
+    fstab = Fstab().read_string(normal_spaces)
+
+    assert fstab.write_string(aligned=True) == (
+        "UUID=1234567890 /    ext4 rw,relatime     0 1\n"
+        "UUID=1231231231 none swap defaults,pri=-2 0 0"
+    )
+
+    handle = io.StringIO()
+    fstab.write_file(handle, aligned=True)
+    assert handle.getvalue() == fstab.write_string(aligned=True)
+
+    assert Fstab().write_string(aligned=True) == ""
+
+    fstab.entries.append(Entry())
+    with pytest.raises(InvalidEntry):
+        fstab.write_string(aligned=True)
+
+
+messy_file = """# Hello world
+UUID=1234567890 / ext4 rw,relatime 0 1
+
+hello world
+/dev/sdb1 /mnt/data xfs defaults 0 x
+/dev/sdc1 /mnt/other xfs defaults 0 +2
+UUID=1231231231 none swap defaults,pri=-2 0 0 extra
+"""
+
+
+def test_parse_lines():
+    lines = parse_lines(messy_file)
+
+    assert [line.lineno for line in lines] == [1, 2, 3, 4, 5, 6, 7]
+    assert [line.kind for line in lines] == [
+        ParsedLine.COMMENT,
+        ParsedLine.ENTRY,
+        ParsedLine.BLANK,
+        ParsedLine.MALFORMED,
+        ParsedLine.BAD_INT,
+        ParsedLine.ENTRY,
+        ParsedLine.MALFORMED,
+    ]
+    assert [bool(line) for line in lines] == [
+        True,
+        True,
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+
+    assert lines[1].entry.device_tag_value == "1234567890"
+    assert lines[1].entry.fsck == 1
+    assert lines[3].reason == "expected 6 fields, got 2"
+    assert lines[4].reason == "fsck is not an integer: 'x'"
+    assert lines[5].entry.fsck == 2
+    assert lines[6].reason == "expected 6 fields, got 7"
+    assert lines[6].line == (
+        "UUID=1231231231 none swap defaults,pri=-2 0 0 extra"
+    )
+    assert lines[0].entry is None
+    assert repr(lines[3]) == (
+        "<ParsedLine 4 malformed: expected 6 fields, got 2>"
+    )
+
+    lazy_lines = parse_lines(messy_file, lazy=True)
+    assert isinstance(lazy_lines[1].entry, LazyEntry)
+    assert isinstance(lazy_lines[5].entry, LazyEntry)
+    assert lazy_lines[5].entry.fsck == 2
+    assert str(lazy_lines[1].entry) == str(lines[1].entry)
+
+
+def test_read_lines():
+    lines = parse_lines(messy_file)
+    fstab = Fstab().read_lines(lines)
+
+    assert [entry.dir for entry in fstab.entries] == ["/", "/mnt/other"]
+    assert fstab.entries_by_type["xfs"] == [fstab.entries[1]]
+
+
+def test_non_strict():
+    fstab = Fstab().read_string(messy_file, strict=False)
+
+    assert len(fstab.entries) == 2
+
+    with pytest.raises(InvalidFstabLine):
+        Fstab().read_string(messy_file)
+
+    with pytest.raises(ValueError):
+        Fstab().read_string("/dev/sdb1 /mnt/data xfs defaults 0 x")
+
+    handle = io.StringIO(messy_file)
+    assert len(Fstab().read_file(handle, strict=False).entries) == 2
+
+
+def test_read_string_twice():
+    fstab = Fstab().read_string(normal_spaces)
+    fstab.read_string(single_device_many_dirs)
+
+    assert [entry.dir for entry in fstab.entries] == [
+        "/my/directory1",
+        "/my/directory2",
+        "/",
+        "none",
+    ]
+    assert [entry.dir for entry in fstab.entries_by_type["ext4"]] == [
+        "/my/directory1",
+        "/my/directory2",
+        "/",
+    ]